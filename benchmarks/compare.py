@@ -0,0 +1,83 @@
+"""
+Compares two results of `benchmarks/hot_paths.py` and fails on regressions.
+
+Metrics ending with `_per_second` are better when higher, ones ending
+with `_seconds` are better when lower, others are informational.
+
+    python benchmarks/compare.py base.json head.json --threshold 0.1
+"""
+
+from argparse import ArgumentParser
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def relative_change(metric: str, base: float, head: float):
+    if not base:
+        return None
+
+    change = head / base - 1
+    if metric.endswith("_per_second"):
+        # Positive change means improvement for all metrics
+        return change
+    if metric.endswith("_seconds"):
+        return -change
+    return None
+
+
+def parse_args():
+    args = ArgumentParser()
+
+    args.add_argument("base", type=str)
+    args.add_argument("head", type=str)
+    args.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown, that is reported as regression",
+    )
+
+    return args.parse_args()
+
+
+def main(args):
+    base, head = load(args.base), load(args.head)
+    if base.get("sizes") != head.get("sizes"):
+        print(f"Warning: comparing '{base.get('sizes')}' and '{head.get('sizes')}' sizes")
+
+    print(f"base: {base.get('commit')}\nhead: {head.get('commit')}\n")
+
+    regressions = []
+    for scenario, head_metrics in head["results"].items():
+        base_metrics = base["results"].get(scenario)
+        if base_metrics is None:
+            continue
+
+        for metric, head_value in head_metrics.items():
+            base_value = base_metrics.get(metric)
+            if base_value is None:
+                continue
+
+            change = relative_change(metric, base_value, head_value)
+            mark = ""
+            if change is not None and change < -args.threshold:
+                mark = "REGRESSION"
+                regressions.append(f"{scenario}.{metric}")
+
+            print(
+                f"{scenario + '.' + metric:<50} {base_value:>14.6g} {head_value:>14.6g} "
+                f"{'' if change is None else f'{change:+.1%}':>8} {mark}"
+            )
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(parse_args())
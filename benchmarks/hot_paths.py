@@ -0,0 +1,525 @@
+"""
+Benchmarks selfauto hot paths on real services with built-in components.
+
+Each scenario boots its own `Service` with components it measures and
+benchmark component, that runs measurement and stops the service. GitLab and
+Telegram APIs are replaced by local aiohttp stand-ins. Results are printed
+(or written) as JSON and may be compared with `benchmarks/compare.py`.
+
+    python benchmarks/hot_paths.py --output head.json
+    python benchmarks/hot_paths.py --quick events_100 webserver
+"""
+
+from argparse import ArgumentParser
+from asyncio import Event, create_task, gather, new_event_loop, sleep, open_connection
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+from typing import ClassVar, Dict, List
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmarks measure working tree, not installed package
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from aiohttp import ClientSession, TCPConnector
+from aiohttp.web import json_response
+
+from selfauto.config import Config
+from selfauto.service import Service
+from selfauto.components.basic_component import BasicComponent
+from selfauto.components.events import BasicEvent
+from selfauto.components.webserver import BasicMiddleware, CacheMiddleware
+
+from stand_ins import GitlabStandIn, TelegramStandIn, find_free_port
+
+SIZES = {
+    "full": {
+        "events_deliveries": 200_000,
+        "events_latency_samples": 200,
+        "schedules": 10_000,
+        "scheduler_window": 5.0,
+        "database_rows": 20_000,
+        "webserver_requests": 20_000,
+        "api_requests": 2_000,
+        "concurrency": 64,
+    },
+    "quick": {
+        "events_deliveries": 20_000,
+        "events_latency_samples": 50,
+        "schedules": 1_000,
+        "scheduler_window": 2.0,
+        "database_rows": 2_000,
+        "webserver_requests": 2_000,
+        "api_requests": 200,
+        "concurrency": 16,
+    },
+}
+
+
+@dataclass()
+class BenchmarkEvent(BasicEvent):
+    ID: ClassVar[str] = "benchmark"
+
+    pushed_at: float
+
+
+class NoopMiddleware(BasicMiddleware):
+    pass
+
+
+class Benchmark(BasicComponent):
+    NAME = "benchmark"
+
+    # Filled for every run by `run_benchmark`
+    PARAMS: ClassVar[dict] = {}
+    RESULTS: ClassVar[dict] = {}
+
+    @staticmethod
+    def make_components_config(params: dict, stand_in) -> Dict[str, dict]:
+        raise NotImplementedError()
+
+    async def on_initialize(self, config):
+        pass
+
+    async def run(self):
+        try:
+            self.RESULTS.update(await self.measure())
+        finally:
+            await self.service.stop()
+
+    async def measure(self) -> dict:
+        raise NotImplementedError()
+
+
+class EventsBenchmark(Benchmark):
+    DEPENDENCIES = ("events",)
+
+    @staticmethod
+    def make_components_config(params, stand_in):
+        return {"events": {}}
+
+    async def measure(self):
+        events = await self.find_component("events")
+        listeners_count = self.PARAMS["listeners"]
+        events_count = max(self.PARAMS["events_deliveries"] // listeners_count, 1)
+
+        delivered = 0
+        expected = 0
+        latencies: List[float] = []
+        all_delivered = Event()
+
+        async def consume(listener):
+            nonlocal delivered
+            async for event in listener:
+                latencies.append(perf_counter() - event.pushed_at)
+                delivered += 1
+                if delivered == expected:
+                    all_delivered.set()
+
+        async with AsyncExitStack() as stack:
+            listeners = [
+                await stack.enter_async_context(
+                    events.subscribe(lambda e: e.id == BenchmarkEvent.ID)
+                )
+                for _ in range(listeners_count)
+            ]
+            consumers = [create_task(consume(listener)) for listener in listeners]
+
+            async def push(count):
+                nonlocal delivered, expected
+                delivered, expected = 0, count * listeners_count
+                all_delivered.clear()
+                latencies.clear()
+
+                for _ in range(count):
+                    events.push_event(BenchmarkEvent(pushed_at=perf_counter()))
+                await all_delivered.wait()
+
+            # Throughput: events are pushed at once and drained by listeners
+            start = perf_counter()
+            await push(events_count)
+            elapsed = perf_counter() - start
+
+            # Latency: single event fan-out at a time
+            fan_out = []
+            for _ in range(self.PARAMS["events_latency_samples"]):
+                await push(1)
+                fan_out.append(max(latencies))
+
+            for consumer in consumers:
+                consumer.cancel()
+            await gather(*consumers, return_exceptions=True)
+
+        return {
+            "listeners": listeners_count,
+            "events": events_count,
+            "events_per_second": events_count / elapsed,
+            "deliveries_per_second": events_count * listeners_count / elapsed,
+            **summarize_latencies("fan_out", fan_out),
+        }
+
+
+class SchedulerBenchmark(Benchmark):
+    DEPENDENCIES = ("events", "scheduler")
+
+    @staticmethod
+    def make_components_config(params, stand_in):
+        # 6th field is seconds, so every schedule fires each second
+        return {
+            "events": {},
+            "scheduler": {
+                "schedules": [
+                    {"label": f"schedule_{i}", "cron_string": "* * * * * *"}
+                    for i in range(params["schedules"])
+                ]
+            },
+        }
+
+    async def measure(self):
+        events = await self.find_component("events")
+
+        # All schedules fire at whole seconds, so triggers are
+        # grouped into bursts by second they were received at
+        bursts: Dict[int, List[float]] = {}
+        async with events.subscribe(lambda e: e.id == "schedule_triggered") as listener:
+            start = perf_counter()
+            while perf_counter() - start < self.PARAMS["scheduler_window"]:
+                await anext(listener)
+                received_at = time()
+                bursts.setdefault(int(received_at), []).append(received_at)
+
+        # First and last bursts may be observed partially
+        bursts = [sorted(b) for _, b in sorted(bursts.items())][1:-1]
+        if not bursts:
+            raise RuntimeError("Scheduler window is too short to observe full burst")
+
+        # Scheduler measures its own wakeup lag, while receive time
+        # also includes events delivery
+        fire_lag = self.metrics.histogram(
+            "selfauto_scheduler_fire_lag_seconds", "", ("label",)
+        )
+        fire_lag_values = [
+            fire_lag.labels(f"schedule_{i}") for i in range(self.PARAMS["schedules"])
+        ]
+
+        dispatched = sum(len(b) for b in bursts)
+        return {
+            "schedules": self.PARAMS["schedules"],
+            "initialization_seconds": self.service.startup_report.components[
+                "scheduler"
+            ].duration,
+            "dispatches_per_burst": dispatched / len(bursts),
+            "dispatches_per_second": dispatched
+            / max(sum(b[-1] - b[0] for b in bursts), 1e-9),
+            "fire_lag_mean_seconds": sum(v.sum for v in fire_lag_values)
+            / max(sum(v.count for v in fire_lag_values), 1),
+            **summarize_latencies("delivery_lag", [t % 1.0 for b in bursts for t in b]),
+        }
+
+
+class DatabaseBenchmark(Benchmark):
+    DEPENDENCIES = ("database",)
+
+    @staticmethod
+    def make_components_config(params, stand_in):
+        return {"database": {"path": os.path.join(params["tmp_dir"], "db.sqlite")}}
+
+    async def measure(self):
+        database = await self.find_component("database")
+        rows = self.PARAMS["database_rows"]
+
+        await database.execute_script(
+            "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, payload TEXT)"
+        )
+        await database.commit()
+
+        start = perf_counter()
+        for i in range(rows):
+            await database.execute(
+                "INSERT INTO items (id, payload) VALUES (?, ?)", (i, f"payload-{i}")
+            )
+            if i % 100 == 99:
+                await database.commit()
+        await database.commit()
+        writes_elapsed = perf_counter() - start
+
+        start = perf_counter()
+        for i in range(rows):
+            await database.execute_fetchall("SELECT payload FROM items WHERE id = ?", (i,))
+        reads_elapsed = perf_counter() - start
+
+        return {
+            "rows": rows,
+            "writes_per_second": rows / writes_elapsed,
+            "reads_per_second": rows / reads_elapsed,
+        }
+
+
+class WebserverBenchmark(Benchmark):
+    DEPENDENCIES = ("webserver",)
+
+    @staticmethod
+    def make_components_config(params, stand_in):
+        return {
+            "webserver": {
+                "listen": "127.0.0.1",
+                "port": params["port"],
+                "access_log_enabled": False,
+            }
+        }
+
+    async def on_initialize(self, config):
+        webserver = await self.find_component("webserver")
+
+        cache = CacheMiddleware()
+        for _ in range(3):
+            webserver.add_middleware(NoopMiddleware())
+        webserver.add_middleware(cache)
+
+        webserver.add_handler("GET", "/plain/{id}", self.__on_request)
+        webserver.add_handler("GET", "/cached/{id}", self.__on_request)
+        cache.add_route("GET", "/cached/{id}", ttl=60)
+
+    async def __on_request(self, request):
+        return json_response({"id": request.match_info["id"], "items": list(range(20))})
+
+    async def measure(self):
+        port = self.PARAMS["port"]
+        await wait_for_port(port)
+
+        results = {}
+        for route in ("plain", "cached"):
+            async with ClientSession(
+                connector=TCPConnector(limit=self.PARAMS["concurrency"])
+            ) as session:
+
+                async def request(i):
+                    # Few distinct paths, so cached route is mostly served from cache
+                    async with session.get(
+                        f"http://127.0.0.1:{port}/{route}/{i % 10}"
+                    ) as resp:
+                        await resp.read()
+
+                results.update(
+                    await run_concurrently(
+                        route,
+                        request,
+                        self.PARAMS["webserver_requests"],
+                        self.PARAMS["concurrency"],
+                    )
+                )
+
+        return results
+
+
+class GitlabBenchmark(Benchmark):
+    DEPENDENCIES = ("gitlab",)
+
+    @staticmethod
+    def make_components_config(params, stand_in):
+        return {"gitlab": {"token": "benchmark", "host": stand_in.url}}
+
+    async def measure(self):
+        gitlab = await self.find_component("gitlab")
+
+        async def request(i):
+            await gitlab.requests.remove_label(1, i, "benchmark")
+
+        return await run_concurrently(
+            "requests",
+            request,
+            self.PARAMS["api_requests"],
+            self.PARAMS["concurrency"],
+        )
+
+
+class TelegramBenchmark(Benchmark):
+    DEPENDENCIES = ("telegram",)
+
+    @staticmethod
+    def make_components_config(params, stand_in):
+        return {
+            "telegram": {
+                "bot_token": "1:benchmark",
+                "base_url": f"{stand_in.url}/bot",
+            }
+        }
+
+    async def measure(self):
+        telegram = await self.find_component("telegram")
+        while not telegram.application.running:
+            await sleep(0.01)
+
+        async def request(i):
+            await telegram.application.bot.send_message(chat_id=1, text=f"message {i}")
+
+        return await run_concurrently(
+            "send_message",
+            request,
+            self.PARAMS["api_requests"],
+            self.PARAMS["concurrency"],
+        )
+
+
+SCENARIOS = {
+    "events_1": (EventsBenchmark, None, {"listeners": 1}),
+    "events_100": (EventsBenchmark, None, {"listeners": 100}),
+    "events_1000": (EventsBenchmark, None, {"listeners": 1000}),
+    "scheduler": (SchedulerBenchmark, None, {}),
+    "database": (DatabaseBenchmark, None, {}),
+    "webserver": (WebserverBenchmark, None, {}),
+    "gitlab": (GitlabBenchmark, GitlabStandIn, {}),
+    "telegram": (TelegramBenchmark, TelegramStandIn, {}),
+}
+
+
+async def run_concurrently(name, request, count, concurrency) -> dict:
+    latencies = []
+    pending = iter(range(count))
+
+    async def worker():
+        for i in pending:
+            start = perf_counter()
+            await request(i)
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await gather(*[worker() for _ in range(concurrency)])
+    elapsed = perf_counter() - start
+
+    return {
+        f"{name}_per_second": count / elapsed,
+        **summarize_latencies(name, latencies),
+    }
+
+
+def summarize_latencies(name: str, values: List[float]) -> dict:
+    percentiles = (
+        quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    )
+    return {
+        f"{name}_p50_seconds": percentiles[49],
+        f"{name}_p99_seconds": percentiles[98],
+        f"{name}_max_seconds": max(values),
+    }
+
+
+async def wait_for_port(port: int):
+    while True:
+        try:
+            _, writer = await open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await sleep(0.01)
+
+
+async def run_benchmark(name: str, params: dict) -> dict:
+    cls, stand_in_cls, scenario_params = SCENARIOS[name]
+
+    stand_in = None
+    if stand_in_cls is not None:
+        stand_in = stand_in_cls()
+        await stand_in.start()
+
+    results = {}
+    try:
+        with TemporaryDirectory() as tmp_dir:
+            benchmark_params = {
+                **params,
+                **scenario_params,
+                "tmp_dir": tmp_dir,
+                "port": find_free_port(),
+            }
+            benchmark = type(
+                cls.__name__,
+                (cls,),
+                {"PARAMS": benchmark_params, "RESULTS": results},
+            )
+
+            config = Config(
+                components=cls.make_components_config(benchmark_params, stand_in)
+            )
+
+            service = Service()
+            service.add_component(benchmark)
+            service.add_components_from_config(config)
+            await service.run(config)
+    finally:
+        if stand_in is not None:
+            await stand_in.stop()
+
+    if not results:
+        raise RuntimeError(f"Benchmark '{name}' failed")
+
+    return results
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args():
+    args = ArgumentParser()
+
+    args.add_argument("--quick", action="store_true", help="Use smaller sizes")
+    args.add_argument("--output", type=str, default=None)
+    args.add_argument("scenarios", nargs="*", help=", ".join(SCENARIOS))
+
+    return args.parse_args()
+
+
+async def main(args):
+    unknown = set(args.scenarios) - SCENARIOS.keys()
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    sizes = "quick" if args.quick else "full"
+
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        logging.getLogger(__name__).warning("Running '%s' benchmark", name)
+        results[name] = await run_benchmark(name, SIZES[sizes])
+
+    text = json.dumps(
+        {
+            "commit": current_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output is None:
+        print(text)
+        return
+
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    new_event_loop().run_until_complete(main(parse_args()))
@@ -0,0 +1,95 @@
+from asyncio import sleep
+from socket import socket
+
+from aiohttp import web
+
+
+def find_free_port() -> int:
+    with socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StandIn:
+    def __init__(self):
+        self._runner: web.AppRunner = None
+        self.port: int = None
+        self.requests: int = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        app = web.Application()
+        self._setup(app)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        self.port = find_free_port()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    def _setup(self, app: web.Application):
+        raise NotImplementedError()
+
+
+class GitlabStandIn(StandIn):
+    def _setup(self, app: web.Application):
+        app.router.add_put(
+            "/api/v4/projects/{project}/issues/{issue}", self.__on_issue_update
+        )
+
+    async def __on_issue_update(self, request: web.Request):
+        self.requests += 1
+        return web.json_response(
+            {
+                "iid": int(request.match_info["issue"]),
+                "state": request.query.get("state_event"),
+            }
+        )
+
+
+class TelegramStandIn(StandIn):
+    BOT = {
+        "id": 1,
+        "is_bot": True,
+        "first_name": "benchmark",
+        "username": "benchmark_bot",
+    }
+
+    def _setup(self, app: web.Application):
+        app.router.add_post("/bot{token}/{method}", self.__on_method)
+
+    async def __on_method(self, request: web.Request):
+        self.requests += 1
+        method = request.match_info["method"]
+
+        if method == "getMe":
+            return self.__ok(self.BOT)
+
+        if method == "getUpdates":
+            # Long polling without updates
+            await sleep(0.5)
+            return self.__ok([])
+
+        if method == "sendMessage":
+            data = await request.post() or await request.json()
+            return self.__ok(
+                {
+                    "message_id": self.requests,
+                    "date": 0,
+                    "chat": {"id": int(data["chat_id"]), "type": "private"},
+                    "from": self.BOT,
+                    "text": data.get("text", ""),
+                }
+            )
+
+        return self.__ok(True)
+
+    @staticmethod
+    def __ok(result):
+        return web.json_response({"ok": True, "result": result})
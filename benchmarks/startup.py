@@ -0,0 +1,136 @@
+"""
+Measures import and startup time of selfauto in fresh interpreters.
+
+Every scenario is executed with `python -X importtime` several times, median
+wall time and import time are reported as JSON, so results of different
+commits may be compared.
+
+    python benchmarks/startup.py --repeat 10 --output startup.json
+"""
+
+from argparse import ArgumentParser
+from statistics import median
+from time import perf_counter
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_CODE = """
+from selfauto.config import Config
+from selfauto.service import Service
+
+service = Service()
+service.add_components_from_config(Config(components={components!r}))
+"""
+
+SCENARIOS = {
+    "import_service": "import selfauto.service",
+    "import_database": "import selfauto.components.database",
+    "import_events": "import selfauto.components.events",
+    "import_gitlab": "import selfauto.components.gitlab",
+    "import_scheduler": "import selfauto.components.scheduler",
+    "import_telegram": "import selfauto.components.telegram",
+    "import_webserver": "import selfauto.components.webserver",
+    "startup_scheduler_only": STARTUP_CODE.format(
+        components={"events": {}, "scheduler": {"schedules": []}}
+    ),
+    "startup_all": STARTUP_CODE.format(
+        components={
+            "database": {"path": ":memory:"},
+            "events": {},
+            "gitlab": {"token": "", "host": ""},
+            "scheduler": {"schedules": []},
+            "telegram": {"bot_token": ""},
+            "webserver": {"listen": "127.0.0.1", "port": 0},
+        }
+    ),
+}
+
+
+def parse_importtime(output: str):
+    # Lines look like `import time: self [us] | cumulative | imported package`,
+    # nested imports are indented
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append(
+            (name.rstrip(), int(self_us), int(cumulative_us), name[1:] == name[1:].lstrip())
+        )
+
+    return modules
+
+
+def run_scenario(code: str, repeat: int, top: int):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(ROOT, "src")] + env.get("PYTHONPATH", "").split(os.pathsep)
+    )
+
+    wall_times, import_times, modules = [], [], []
+    for _ in range(repeat):
+        start = perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        wall_times.append(perf_counter() - start)
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Scenario failed:\n{process.stderr}")
+
+        modules = parse_importtime(process.stderr)
+        import_times.append(sum(m[2] for m in modules if m[3]))
+
+    return {
+        "wall_seconds": median(wall_times),
+        "import_seconds": median(import_times) / 1e6,
+        "slowest_imports": [
+            {"module": name.strip(), "self_seconds": self_us / 1e6}
+            for name, self_us, _, _ in sorted(modules, key=lambda m: -m[1])[:top]
+        ],
+    }
+
+
+def parse_args():
+    args = ArgumentParser()
+
+    args.add_argument("--repeat", type=int, default=5)
+    args.add_argument("--top", type=int, default=10)
+    args.add_argument("--output", type=str, default=None)
+    args.add_argument("scenarios", nargs="*", help=", ".join(SCENARIOS))
+
+    return args.parse_args()
+
+
+def main(args):
+    unknown = set(args.scenarios) - SCENARIOS.keys()
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = {
+        "python": sys.version,
+        "scenarios": {
+            name: run_scenario(SCENARIOS[name], args.repeat, args.top)
+            for name in (args.scenarios or SCENARIOS)
+        },
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+        return
+
+    with open(args.output, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,129 @@
+from asyncio import to_thread
+from mmap import mmap, ACCESS_READ
+from typing import Dict, List, Optional, Union
+import os
+
+# Assets up to this size are kept in memory, larger ones are mapped
+MMAP_THRESHOLD = 256 * 1024
+
+
+class Asset:
+    def __init__(self, path: str, size: int):
+        self._path: str = path
+        self._size: int = size
+        self._data: Union[bytes, mmap, None] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def view(self) -> memoryview:
+        # Zero copy view to asset content
+        return memoryview(self.load())
+
+    def load(self) -> Union[bytes, mmap]:
+        if self._data is not None:
+            return self._data
+
+        with open(self._path, "rb") as f:
+            if self._size < MMAP_THRESHOLD:
+                self._data = f.read()
+            else:
+                self._data = mmap(f.fileno(), 0, access=ACCESS_READ)
+
+        return self._data
+
+    def read(self) -> bytes:
+        data = self.load()
+        return data if isinstance(data, bytes) else data[:]
+
+    def close(self):
+        if isinstance(self._data, mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # Views are still in use, mapping is released along with them
+                pass
+        self._data = None
+
+
+class AssetManager:
+    def __init__(self, root: str):
+        self._root: str = root
+        self._assets: Optional[Dict[str, Asset]] = None
+        self._listings: Dict[str, List[str]] = {}
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    async def load_index(self):
+        # Directory walk touches disk, so it's done in thread
+        if self._assets is None:
+            await to_thread(self.__index)
+
+    def find(self, path: str) -> Optional[Asset]:
+        return self.__index().get(os.path.normpath(path))
+
+    def get(self, path: str) -> Asset:
+        asset = self.find(path)
+        if asset is None:
+            raise FileNotFoundError(f"No asset '{path}' in '{self._root}'")
+
+        return asset
+
+    async def read(self, path: str) -> bytes:
+        await self.load_index()
+
+        asset = self.get(path)
+        if asset.loaded and isinstance(asset.load(), bytes):
+            return asset.load()
+
+        # Copying from mapping touches disk, so it's done in thread as well
+        return await to_thread(asset.read)
+
+    def list(self, path: str = "") -> List[str]:
+        self.__index()
+
+        listing = self._listings.get(os.path.normpath(path))
+        if listing is None:
+            raise FileNotFoundError(f"No assets directory '{path}' in '{self._root}'")
+
+        return list(listing)
+
+    def close(self):
+        # Index is rebuilt on next access
+        for asset in (self._assets or {}).values():
+            asset.close()
+
+        self._assets = None
+        self._listings = {}
+
+    def __index(self) -> Dict[str, Asset]:
+        if self._assets is not None:
+            return self._assets
+
+        # Index is published at once, since it may be built in thread
+        assets, listings = {}, {}
+        for dirpath, dirnames, filenames in os.walk(self._root):
+            directory = os.path.relpath(dirpath, self._root)
+            listings[directory] = sorted(dirnames + filenames)
+
+            for name in filenames:
+                full_path = os.path.join(dirpath, name)
+                assets[os.path.normpath(os.path.join(directory, name))] = Asset(
+                    full_path, os.path.getsize(full_path)
+                )
+
+        self._listings = listings
+        self._assets = assets
+        return assets
@@ -1,14 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from logging import Logger
 from asyncio import Condition
 import inspect
 import os
 
-import aiofiles
+from selfauto.assets import AssetManager
 
 
 class BasicComponent(ABC):
+    # Components (classes or names), that have to be initialized before this one
+    DEPENDENCIES: Tuple = ()
+
     def __init__(
         self,
         components: Dict[str, "BasicComponent"],
@@ -20,6 +23,13 @@ class BasicComponent(ABC):
         self._initialized_condvar: Condition = Condition()
         self._logger: Logger = logger
         self._service = service
+        self.__assets: AssetManager = None
+
+    @classmethod
+    def dependency_names(cls, config: Optional[dict] = None) -> List[str]:
+        # `config` is raw component's config section, so components
+        # may depend on others only when some feature is enabled
+        return [d if isinstance(d, str) else d.NAME for d in cls.DEPENDENCIES]
 
     @property
     def logger(self) -> Logger:
@@ -29,6 +39,10 @@ class BasicComponent(ABC):
     def service(self) -> "Service":
         return self._service
 
+    @property
+    def metrics(self) -> "MetricsRegistry":
+        return self._service.metrics
+
     async def wait_for_initialization(self):
         async with self._initialized_condvar:
             await self._initialized_condvar.wait_for(lambda: self._initialized)
@@ -59,20 +73,35 @@ class BasicComponent(ABC):
 
         return component
 
+    @property
+    def assets(self) -> AssetManager:
+        if self.__assets is None:
+            path = os.path.split(inspect.getfile(type(self)))[0]
+            self.__assets = AssetManager(os.path.join(path, "assets"))
+
+        return self.__assets
+
     async def read_asset(self, path: str) -> bytes:
-        async with aiofiles.open(
-            os.path.join(self.__make_assets_path(), path), "r"
-        ) as f:
-            return await f.read()
+        return await self.assets.read(path)
 
-    def list_assets(self, path: str):
-        return os.listdir(os.path.join(self.__make_assets_path(), path))
+    def list_assets(self, path: str) -> List[str]:
+        return self.assets.list(path)
 
-    def __make_assets_path(self):
-        path = os.path.split(inspect.getfile(type(self)))[0]
-        return os.path.join(path, "assets")
+    async def run_blocking(self, fn, *args, **kwargs):
+        # Runs blocking function in service's threads pool
+        return await self._service.executors.run_blocking(
+            type(self).NAME, fn, *args, **kwargs
+        )
+
+    async def run_cpu(self, fn, *args, **kwargs):
+        # Runs CPU heavy function in service's processes pool
+        return await self._service.executors.run_cpu(
+            type(self).NAME, fn, *args, **kwargs
+        )
 
     async def initialize(self, *args, **kwargs):
+        # Assets are indexed ahead, so requests never walk directory on loop
+        await self.assets.load_index()
         await self.on_initialize(*args, **kwargs)
         self._initialized = True
 
@@ -80,8 +109,15 @@ class BasicComponent(ABC):
             self._initialized_condvar.notify_all()
 
     async def deinitialize(self):
+        self._initialized = False
         await self.on_deinitialize()
 
+        if self.__assets is not None:
+            self.__assets.close()
+
+    async def reconfigure(self, config) -> bool:
+        return await self.on_reconfigure(config)
+
     async def run(self):
         pass
 
@@ -91,3 +127,7 @@ class BasicComponent(ABC):
 
     async def on_deinitialize(self):
         pass
+
+    async def on_reconfigure(self, config) -> bool:
+        # Returning False makes service restart component with new config
+        return False
@@ -22,10 +22,17 @@ class DatabaseComponent(BasicComponent):
 
         self._connection: Connection = None
         self._semaphore: Lock = Lock()
+        self._query_duration = None
 
     async def on_initialize(self, config: Config):
+        self._query_duration = self.metrics.histogram(
+            "selfauto_database_query_duration_seconds",
+            "Database operations duration",
+            ("operation",),
+        )
+
         self.logger.info("Connecting to database")
-        self._connection = await aiosqlite.connect(config.path)
+        self._connection = await connect(config.path)
         self.logger.info("Connected")
 
     async def on_deinitialize(self):
@@ -43,13 +50,17 @@ class DatabaseComponent(BasicComponent):
         self._semaphore.release()
 
     async def execute_script(self, query):
-        return await self._connection.executescript(query)
+        with self._query_duration.labels("execute_script").time():
+            return await self._connection.executescript(query)
 
     async def execute(self, query, parameters=None):
-        return await self._connection.execute(query, parameters)
+        with self._query_duration.labels("execute").time():
+            return await self._connection.execute(query, parameters)
 
     async def execute_fetchall(self, query, parameters=None):
-        return await self._connection.execute_fetchall(query, parameters)
+        with self._query_duration.labels("execute_fetchall").time():
+            return await self._connection.execute_fetchall(query, parameters)
 
     async def commit(self):
-        await self._connection.commit()
+        with self._query_duration.labels("commit").time():
+            await self._connection.commit()
@@ -1,3 +1,3 @@
 from .events_component import EventsComponent as Component
 from .basic_event import BasicEvent
-from .listener import Listener
+from .listener import Listener, ListenerOverflow
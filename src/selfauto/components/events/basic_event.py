@@ -1,3 +1,7 @@
+from functools import cached_property
+from json import dumps
+
+
 class BasicEvent:
     @property
     def id(self):
@@ -13,3 +17,13 @@ class BasicEvent:
             result["data"] = self.json_data
 
         return result
+
+    @cached_property
+    def json_encoded(self) -> str:
+        # Event is encoded once, no matter how many consumers will send it
+        return dumps(self.json_dict)
+
+    @cached_property
+    def sse_frame(self) -> bytes:
+        # Server-sent events frame, shared by all stream clients
+        return f"event: {self.ID}\ndata: {self.json_encoded}\n\n".encode()
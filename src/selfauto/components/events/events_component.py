@@ -16,11 +16,27 @@ class EventsComponent(BasicComponent):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.__subscribers: Set[Listener] = set()
+        self.__pushed_events = None
 
     async def on_initialize(self, _):
-        pass
+        self.__pushed_events = self.metrics.counter(
+            "selfauto_events_pushed_total",
+            "Events pushed through events component",
+            ("event_id",),
+        )
+        self.metrics.gauge(
+            "selfauto_events_listeners",
+            "Subscribed events listeners",
+        ).set_function(lambda: len(self.__subscribers))
+        self.metrics.gauge(
+            "selfauto_events_listeners_queue_depth",
+            "Events buffered by all listeners, but not consumed yet",
+        ).set_function(lambda: sum(sub.buffer_size for sub in self.__subscribers))
 
     def push_event(self, event: BasicEvent):
+        if self.__pushed_events is not None:
+            self.__pushed_events.labels(event.id).inc()
+
         for sub in self.__subscribers:
             sub.feed_event(event)
 
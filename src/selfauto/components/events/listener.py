@@ -1,22 +1,50 @@
-from asyncio import Condition, run_coroutine_threadsafe, get_event_loop
+from asyncio import Event
+from collections import deque
+from typing import Optional
 
 from .basic_event import BasicEvent
 
 
+class ListenerOverflow(Exception):
+    pass
+
+
 class Listener:
-    def __init__(self, parent_component: "EventsComponent", matcher=None):
+    def __init__(
+        self,
+        parent_component: "EventsComponent",
+        matcher=None,
+        max_buffer_size: Optional[int] = None,
+    ):
         self._parent_component: "EventsComponent" = parent_component
-        self._buffer = []
-        self._event_received_condition = Condition()
+        self._buffer = deque()
+        self._event_received = Event()
         self._matcher = matcher
+        self._max_buffer_size: Optional[int] = max_buffer_size
+        self._overflowed: bool = False
 
     @property
     def parent(self) -> "EventsComponent":
         return self._parent_component
 
+    @property
+    def buffer_size(self) -> int:
+        return len(self._buffer)
+
     def feed_event(self, event: BasicEvent):
-        self._buffer.append(event)
-        run_coroutine_threadsafe(self.__notify_event(), get_event_loop())
+        # Filtering on feeding, so not matched events don't occupy buffer
+        if self._matcher is not None and not self._matcher(event):
+            return
+
+        if (
+            self._max_buffer_size is not None
+            and len(self._buffer) >= self._max_buffer_size
+        ):
+            self._overflowed = True
+        else:
+            self._buffer.append(event)
+
+        self._event_received.set()
 
     async def __aenter__(self):
         self.parent.add_subscriber(self)
@@ -31,15 +59,13 @@ class Listener:
 
     async def __anext__(self) -> BasicEvent:
         while True:
-            while not self._buffer:
-                async with self._event_received_condition:
-                    await self._event_received_condition.wait()
-
-            event = self._buffer.pop(0)
-            if self._matcher is not None:
-                if self._matcher(event):
-                    return event
-
-    async def __notify_event(self):
-        async with self._event_received_condition:
-            self._event_received_condition.notify_all()
+            if self._overflowed:
+                raise ListenerOverflow(
+                    f"Listener buffer exceeded {self._max_buffer_size} events"
+                )
+
+            if self._buffer:
+                return self._buffer.popleft()
+
+            self._event_received.clear()
+            await self._event_received.wait()
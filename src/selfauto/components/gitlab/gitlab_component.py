@@ -24,7 +24,7 @@ class GitlabComponent(BasicComponent):
         self._requests_client: RequestsClient = None
 
     async def on_initialize(self, config: Config):
-        self._requests_client = RequestsClient(config.host, config.token)
+        self._requests_client = RequestsClient(config.host, config.token, self.metrics)
 
     @property
     def requests(self):
@@ -1,10 +1,24 @@
+from time import perf_counter
+
 from aiohttp import ClientSession, TCPConnector
 
+from selfauto.metrics import MetricsRegistry
+
 
 class RequestsClient:
-    def __init__(self, host: str, token: str):
+    def __init__(self, host: str, token: str, metrics: MetricsRegistry):
         self._host: str = host
         self._token: str = token
+        self._requests = metrics.counter(
+            "selfauto_gitlab_requests_total",
+            "Requests performed to GitLab API",
+            ("method", "status"),
+        )
+        self._request_duration = metrics.histogram(
+            "selfauto_gitlab_request_duration_seconds",
+            "GitLab API requests duration",
+            ("method",),
+        )
 
     async def remove_label(self, project_id, issue_id, label):
         await self.__perform_request(
@@ -13,11 +27,18 @@ class RequestsClient:
         )
 
     async def __perform_request(self, method, path, **kwargs):
-        async with ClientSession(
-            connector=TCPConnector(ssl=False),
-            headers={"PRIVATE-TOKEN": self._token},
-        ) as session:
-            async with getattr(session, method.lower())(
-                f"{host}/api/v4{path}", **kwargs
-            ) as resp:
-                resp.raise_for_status()
+        status = "error"
+        start = perf_counter()
+        try:
+            async with ClientSession(
+                connector=TCPConnector(ssl=False),
+                headers={"PRIVATE-TOKEN": self._token},
+            ) as session:
+                async with getattr(session, method.lower())(
+                    f"{self._host}/api/v4{path}", **kwargs
+                ) as resp:
+                    status = str(resp.status)
+                    resp.raise_for_status()
+        finally:
+            self._request_duration.labels(method).observe(perf_counter() - start)
+            self._requests.labels(method, status).inc()
@@ -0,0 +1,45 @@
+from importlib import import_module
+from typing import Dict, Optional
+
+# Third party packages may register their components under this entry points group
+ENTRY_POINTS_GROUP = "selfauto.components"
+
+# Built-in components are referred by module, so their (heavy)
+# dependencies are imported only when component is actually used
+BUILTIN_COMPONENTS: Dict[str, str] = {
+    "database": "selfauto.components.database",
+    "events": "selfauto.components.events",
+    "gitlab": "selfauto.components.gitlab",
+    "scheduler": "selfauto.components.scheduler",
+    "telegram": "selfauto.components.telegram",
+    "webserver": "selfauto.components.webserver",
+}
+
+_entry_points = None
+
+
+def find_component_class(name: str) -> Optional[type]:
+    module_name = BUILTIN_COMPONENTS.get(name)
+    if module_name is not None:
+        return import_module(module_name).Component
+
+    entry_point = _find_entry_points().get(name)
+    if entry_point is not None:
+        return entry_point.load()
+
+    return None
+
+
+def _find_entry_points():
+    global _entry_points
+    if _entry_points is None:
+        # importlib.metadata scans installed distributions, so it's
+        # imported and queried only when non built-in component is requested
+        from importlib.metadata import entry_points
+
+        _entry_points = {
+            entry_point.name: entry_point
+            for entry_point in entry_points(group=ENTRY_POINTS_GROUP)
+        }
+
+    return _entry_points
@@ -18,6 +18,7 @@ class Schedule:
 
 class SchedulerComponent(BasicComponent):
     NAME = "scheduler"
+    DEPENDENCIES = (events.Component,)
 
     @dataclass()
     class Config:
@@ -46,11 +47,19 @@ class SchedulerComponent(BasicComponent):
         self.__crons = {}
         self.__events: events.Component = None
         self.__tasks = []
+        self.__fire_lag = None
 
     async def on_initialize(self, config: "Config"):
         self.__events = await self.find_component(events.Component)
+        self.__fire_lag = self.metrics.histogram(
+            "selfauto_scheduler_fire_lag_seconds",
+            "Delay between schedule trigger time and actual event push",
+            ("label",),
+        )
 
         # Load dependencies
+        self.__crons = {}
+        self.__tasks = []
         for schedule in config.schedules:
             self.__crons[schedule.label] = croniter(schedule.cron_string)
 
@@ -62,6 +71,7 @@ class SchedulerComponent(BasicComponent):
     async def __handle_cron(self, label: str):
         self.logger.info(f"Running cron handler for {label}")
         iterator = self.__crons.get(label)
+        fire_lag = self.__fire_lag.labels(label)
         while True:
             now = datetime.utcnow()
             next_trigger_time = iterator.get_next(datetime)
@@ -75,4 +85,7 @@ class SchedulerComponent(BasicComponent):
                 )
                 await sleep(need_to_sleep_for)
 
+            fire_lag.observe(
+                max((datetime.utcnow() - next_trigger_time).total_seconds(), 0)
+            )
             self.__events.push_event(ScheduleTriggered(label=label))
@@ -1,10 +1,12 @@
 from traceback import format_exception
 from dataclasses import dataclass
+from typing import Optional
 from asyncio import sleep
 
 from selfauto.components.basic_component import BasicComponent
 
 from telegram import Update
+from telegram.constants import ParseMode
 from telegram.ext import ContextTypes, Application, CommandHandler
 from telegram.error import TelegramError
 
@@ -44,6 +46,8 @@ class TelegramComponent(BasicComponent):
     @dataclass()
     class Config:
         bot_token: str
+        # Bot API endpoint, token is appended to it
+        base_url: Optional[str] = None
 
     @staticmethod
     def make_default_config() -> Config:
@@ -53,6 +57,7 @@ class TelegramComponent(BasicComponent):
         super().__init__(*args, **kwargs)
         self._app: Application | None = None
         self._error_notify_text = DEFAULT_ERROR_NOTIFY_TEXT
+        self._send_failures = None
 
     @staticmethod
     def __dummy_escape(text: str):
@@ -77,15 +82,23 @@ class TelegramComponent(BasicComponent):
         if update is None:
             await self.notify(
                 text=text,
-                parse_mode=telegram.constants.ParseMode.MARKDOWN_V2,
+                parse_mode=ParseMode.MARKDOWN_V2,
             )
             return
 
-        await self._app.bot.send_message(
-            chat_id=update.effective_chat.id,
-            text=text,
-            parse_mode=telegram.constants.ParseMode.MARKDOWN_V2,
-        )
+        try:
+            await self._app.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text=text,
+                parse_mode=ParseMode.MARKDOWN_V2,
+            )
+        except Exception as e:
+            self._send_failures.inc()
+            self.logger.error(
+                "Unable to send error to %s chat",
+                str(update.effective_chat.id),
+                exc_info=e,
+            )
 
     def __run_error_callback(self, exc: TelegramError):
         try:
@@ -105,15 +118,35 @@ class TelegramComponent(BasicComponent):
             try:
                 await self._app.bot.send_message(*args, chat_id=chat_id, **kwargs)
             except Exception as e:
+                self._send_failures.inc()
                 self.logger.error("Unable to notify %s chat", str(chat_id), exc_info=e)
 
     async def on_initialize(self, config: Config):
-        self._app = Application.builder().token(config.bot_token).build()
+        self._send_failures = self.metrics.counter(
+            "selfauto_telegram_send_failures_total",
+            "Telegram messages, that failed to be sent",
+        )
+
+        previous_app = self._app
+
+        builder = Application.builder().token(config.bot_token)
+        if config.base_url is not None:
+            builder = builder.base_url(config.base_url)
+
+        self._app = builder.build()
         self._app.add_error_handler(self.__error_handler)
-        self._app.add_handler(CommandHandler("test", self.__test))
+
+        if previous_app is None:
+            self._app.add_handler(CommandHandler("test", self.__test))
+            return
+
+        # On restart handlers, added by other components, are moved to new application
+        for group, handlers in previous_app.handlers.items():
+            for handler in handlers:
+                self._app.add_handler(handler, group)
 
     async def __test(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        await notify(text="Hello")
+        await self.notify(text="Hello")
 
     async def run(self):
         async with ApplicationRunner(self._app, self.__run_error_callback):
@@ -1,2 +1,3 @@
 from .webserver_component import WebserverComponent as Component
 from .basic_middleware import BasicMiddleware
+from .cache_middleware import CacheMiddleware
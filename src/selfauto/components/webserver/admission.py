@@ -0,0 +1,35 @@
+from asyncio import Semaphore, wait_for
+
+
+class AdmissionLimiter:
+    def __init__(self, max_concurrency: int, max_queue_size: int, queue_timeout: float):
+        self._semaphore: Semaphore = Semaphore(max_concurrency)
+        self._max_queue_size: int = max_queue_size
+        self._queue_timeout: float = queue_timeout
+        self._waiting: int = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self) -> bool:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return True
+
+        # Rejecting right away instead of growing queue, that
+        # will never be drained in time
+        if self._waiting >= self._max_queue_size:
+            return False
+
+        self._waiting += 1
+        try:
+            await wait_for(self._semaphore.acquire(), self._queue_timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+
+    def release(self):
+        self._semaphore.release()
@@ -1,13 +1,23 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
-from aiohttp.web import Request, Response
+from aiohttp.web import Request, Response, StreamResponse
 
 
 class BasicMiddleware:
-    async def on_before_request(self, request: Request):
+    async def on_before_request(self, request: Request) -> Optional[StreamResponse]:
+        # Returning response here skips handler execution
         pass
 
-    async def on_after_request(self, request: Request, response: Response):
+    async def on_lookup(self, request: Request) -> Optional[StreamResponse]:
+        # Called once all `on_before_request` passed, returned response
+        # (e.g. cached one) is used instead of handler's
+        pass
+
+    async def on_after_request(
+        self, request: Request, response: Response
+    ) -> Optional[StreamResponse]:
+        # Returning response here replaces handler's response
         pass
 
     async def on_error(self, request: Request, e: Exception):
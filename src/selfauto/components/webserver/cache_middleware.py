@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import hdrs
+from aiohttp.web import Request, Response, StreamResponse
+
+from .basic_middleware import BasicMiddleware
+
+# Headers, that describe transfer of concrete response and
+# must not be replayed from cache
+SKIPPED_HEADERS = (hdrs.CONTENT_LENGTH, hdrs.DATE, hdrs.TRANSFER_ENCODING)
+
+# Headers, that identify client, responses of not shared routes are keyed by them
+CLIENT_HEADERS = (hdrs.AUTHORIZATION, hdrs.COOKIE)
+
+
+@dataclass()
+class CacheRule:
+    ttl: float
+    vary_headers: Tuple[str, ...] = ()
+    shared: bool = False
+
+    @property
+    def key_headers(self) -> Tuple[str, ...]:
+        if self.shared:
+            return self.vary_headers
+
+        return self.vary_headers + CLIENT_HEADERS
+
+
+@dataclass()
+class CacheEntry:
+    route: str
+    status: int
+    body: bytes
+    headers: Dict[str, str]
+    etag: str
+    expires_at: float
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        self.size = len(self.body) + sum(
+            len(k) + len(v) for k, v in self.headers.items()
+        )
+
+
+class CacheMiddleware(BasicMiddleware):
+    def __init__(self, max_size: int = 16 * 1024 * 1024):
+        self._max_size: int = max_size
+        self._size: int = 0
+        self._rules: Dict[Tuple[str, str], CacheRule] = {}
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def add_route(
+        self, method: str, path: str, ttl: float, vary_headers=(), shared=False
+    ):
+        # Responses are cached per `Authorization` and `Cookie` values,
+        # unless route is explicitly `shared` between all clients
+        self._rules[(method.upper(), path)] = CacheRule(
+            ttl=ttl,
+            vary_headers=tuple(vary_headers),
+            shared=shared,
+        )
+
+    def invalidate(self, path: Optional[str] = None):
+        if path is None:
+            self._entries.clear()
+            self._size = 0
+            return
+
+        for key, entry in list(self._entries.items()):
+            if entry.route == path:
+                self.__remove(key)
+
+    async def invalidate_on_events(self, events_component, invalidations):
+        # `invalidations` maps event ID to list of route paths, that have to be
+        # invalidated on this event. `None` instead of list drops whole cache.
+        async with events_component.subscribe(
+            lambda event: event.id in invalidations
+        ) as listener:
+            async for event in listener:
+                paths: Optional[List[str]] = invalidations[event.id]
+                if paths is None:
+                    self.invalidate()
+                    continue
+
+                for path in paths:
+                    self.invalidate(path)
+
+    async def on_lookup(self, request: Request):
+        key = self.__make_key(request)
+        if key is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= monotonic():
+            self.__remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        request["cache_hit"] = True
+
+        if self.__is_not_modified(request, entry.etag):
+            return Response(status=304, headers={hdrs.ETAG: entry.etag})
+
+        return Response(status=entry.status, body=entry.body, headers=entry.headers)
+
+    async def on_after_request(self, request: Request, response: StreamResponse):
+        if response is None or request.get("cache_hit"):
+            return None
+
+        if (
+            response.status != 200
+            or not isinstance(response, Response)
+            or not isinstance(response.body, bytes)
+            or hdrs.SET_COOKIE in response.headers
+        ):
+            return None
+
+        key = self.__make_key(request)
+        if key is None:
+            return None
+
+        rule = self._rules[key[0], key[1]]
+        etag = '"{}"'.format(blake2b(response.body, digest_size=16).hexdigest())
+        response.headers[hdrs.ETAG] = etag
+
+        # Downstream caches have to key responses same way
+        vary = [
+            h.strip()
+            for value in response.headers.getall(hdrs.VARY, [])
+            for h in value.split(",")
+            if h.strip()
+        ]
+        vary.extend(rule.key_headers)
+        if vary:
+            response.headers[hdrs.VARY] = ", ".join(dict.fromkeys(vary))
+
+        self.__store(
+            key,
+            CacheEntry(
+                route=key[1],
+                status=response.status,
+                body=response.body,
+                headers={
+                    k: v
+                    for k, v in response.headers.items()
+                    if k not in SKIPPED_HEADERS
+                },
+                etag=etag,
+                expires_at=monotonic() + rule.ttl,
+            ),
+        )
+
+        if self.__is_not_modified(request, etag):
+            return Response(status=304, headers={hdrs.ETAG: etag})
+
+        return None
+
+    def __make_key(self, request: Request) -> Optional[tuple]:
+        route = request.match_info.route.resource
+        if route is None:
+            return None
+
+        path = route.canonical
+        rule = self._rules.get((request.method, path))
+        if rule is None:
+            return None
+
+        return (
+            request.method,
+            path,
+            request.path,
+            request.query_string,
+            tuple(request.headers.get(h) for h in rule.key_headers),
+        )
+
+    def __store(self, key: tuple, entry: CacheEntry):
+        if entry.size > self._max_size:
+            return
+
+        if key in self._entries:
+            self.__remove(key)
+
+        self._entries[key] = entry
+        self._size += entry.size
+
+        while self._size > self._max_size:
+            self.__remove(next(iter(self._entries)))
+
+    def __remove(self, key: tuple):
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+
+    @staticmethod
+    def __is_not_modified(request: Request, etag: str) -> bool:
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+        if if_none_match is None:
+            return False
+
+        return any(
+            tag.strip() in (etag, "*", f"W/{etag}") for tag in if_none_match.split(",")
+        )
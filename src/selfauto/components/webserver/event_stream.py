@@ -0,0 +1,114 @@
+from asyncio import create_task, gather, wait_for
+from logging import Logger
+
+from aiohttp import hdrs, WSCloseCode
+from aiohttp.web import Request, StreamResponse, WebSocketResponse
+
+from selfauto.components.events import Listener, ListenerOverflow
+
+
+class EventStream:
+    def __init__(
+        self,
+        events_component: "EventsComponent",
+        logger: Logger,
+        queue_size: int = 256,
+        keepalive_interval: float = 15.0,
+    ):
+        self._events: "EventsComponent" = events_component
+        self._logger: Logger = logger
+        self._queue_size: int = queue_size
+        self._keepalive_interval: float = keepalive_interval
+        self._clients_count: int = 0
+
+    @property
+    def clients_count(self) -> int:
+        return self._clients_count
+
+    async def handle(self, request: Request):
+        ids = frozenset(request.query.getall("id", []))
+        matcher = (lambda event: event.id in ids) if ids else None
+
+        self._clients_count += 1
+        try:
+            async with self._events.subscribe(
+                matcher, max_buffer_size=self._queue_size
+            ) as listener:
+                ws = WebSocketResponse(heartbeat=self._keepalive_interval)
+                if ws.can_prepare(request).ok:
+                    return await self.__handle_websocket(request, ws, listener)
+
+                return await self.__handle_sse(request, listener)
+        finally:
+            self._clients_count -= 1
+
+    async def __handle_sse(self, request: Request, listener: Listener):
+        response = StreamResponse(
+            headers={
+                hdrs.CONTENT_TYPE: "text/event-stream",
+                hdrs.CACHE_CONTROL: "no-cache",
+            }
+        )
+        await response.prepare(request)
+
+        try:
+            await self.__forward(
+                listener,
+                lambda event: response.write(event.sse_frame),
+                lambda: response.write(b": keepalive\n\n"),
+            )
+        except ListenerOverflow:
+            self._logger.warning(
+                "Disconnecting slow event stream client %s", request.remote
+            )
+        except ConnectionResetError:
+            pass
+
+        return response
+
+    async def __handle_websocket(
+        self, request: Request, ws: WebSocketResponse, listener: Listener
+    ):
+        await ws.prepare(request)
+
+        async def send_events():
+            try:
+                await self.__forward(
+                    listener, lambda event: ws.send_str(event.json_encoded)
+                )
+            except ListenerOverflow:
+                self._logger.warning(
+                    "Disconnecting slow event stream client %s", request.remote
+                )
+                await ws.close(code=WSCloseCode.TRY_AGAIN_LATER)
+            except ConnectionResetError:
+                pass
+
+        sender = create_task(send_events())
+        try:
+            # Incoming messages are ignored, but have to be read
+            # to process control frames
+            async for _ in ws:
+                pass
+        finally:
+            sender.cancel()
+            result = (await gather(sender, return_exceptions=True))[0]
+            if isinstance(result, Exception):
+                self._logger.error(
+                    "Event stream sender of %s failed", request.remote, exc_info=result
+                )
+
+        return ws
+
+    async def __forward(self, listener: Listener, send, keepalive=None):
+        while True:
+            if keepalive is None:
+                event = await anext(listener)
+            else:
+                try:
+                    event = await wait_for(anext(listener), self._keepalive_interval)
+                except TimeoutError:
+                    await keepalive()
+                    continue
+
+            await send(event)
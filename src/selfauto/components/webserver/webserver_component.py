@@ -1,10 +1,39 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field, replace
+from time import perf_counter
+from typing import Dict, List, Optional, Set
 
 import aiohttp.web
 
 from selfauto.components.basic_component import BasicComponent
+from selfauto.components import events
+from .admission import AdmissionLimiter
 from .basic_middleware import BasicMiddleware
+from .event_stream import EventStream
+
+# Config fields, that may be changed without restarting server
+ADMISSION_FIELDS = (
+    "max_concurrency",
+    "max_queue_size",
+    "queue_timeout",
+    "retry_after",
+    "route_max_concurrency",
+    "priority_routes",
+)
+
+
+@dataclass()
+class Route:
+    method: str
+    path: str
+    handler: object
+    max_concurrency: Optional[int] = None
+    priority: bool = False
+    # Long living responses, which duration isn't request latency
+    streaming: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
 
 
 class WebserverComponent(BasicComponent):
@@ -15,6 +44,15 @@ class WebserverComponent(BasicComponent):
         listen: str
         port: int
         access_log_enabled: bool = True
+        event_stream_path: Optional[str] = None
+        event_stream_queue_size: int = 256
+        max_concurrency: Optional[int] = None
+        max_queue_size: int = 32
+        queue_timeout: float = 1.0
+        retry_after: int = 1
+        route_max_concurrency: Dict[str, int] = field(default_factory=dict)
+        priority_routes: List[str] = field(default_factory=list)
+        metrics_path: Optional[str] = None
 
     @staticmethod
     def make_default_config():
@@ -24,24 +62,140 @@ class WebserverComponent(BasicComponent):
             access_log_enabled=False,
         )
 
+    @classmethod
+    def dependency_names(cls, config: Optional[dict] = None) -> List[str]:
+        names = super().dependency_names(config)
+        if config and config.get("event_stream_path") is not None:
+            names.append(events.Component.NAME)
+
+        return names
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self._app = aiohttp.web.Application()
+        self._routes: Dict[str, Route] = {}
+        self._config_routes: List[Route] = []
         self._middlewares: List[BasicMiddleware] = []
         self._config: Config = None
+        self._limiter: Optional[AdmissionLimiter] = None
+        self._route_limiters: Dict[str, AdmissionLimiter] = {}
+        self._priority_routes: Set[str] = set()
+        self._requests = None
+        self._request_duration = None
 
     def add_middleware(self, middleware: BasicMiddleware):
         self._middlewares.append(middleware)
 
-    def add_handler(self, method, path, handler):
-        self._app.add_routes(
-            [getattr(aiohttp.web, method.lower())(path, self.__make_handler(handler))]
+    def add_handler(
+        self,
+        method,
+        path,
+        handler,
+        max_concurrency=None,
+        priority=False,
+        streaming=False,
+    ):
+        route = Route(
+            method.upper(), path, handler, max_concurrency, priority, streaming
         )
 
+        recorded = self._routes.get(route.name)
+        if recorded is None:
+            self.__add_route(route)
+
+            # Routes are recorded once registered, so they survive component restart
+            self._routes[route.name] = route
+            return
+
+        # Same route is added again by restarted component. Running application
+        # can't be changed, so registered wrapper just switches to new handler
+        recorded.handler = handler
+        recorded.streaming = streaming
+        if (recorded.max_concurrency, recorded.priority) != (max_concurrency, priority):
+            recorded.max_concurrency = max_concurrency
+            recorded.priority = priority
+            self.__reapply_route_admission(recorded)
+
+    def add_event_stream(self, path, events_component, queue_size=256):
+        stream = EventStream(events_component, self.logger, queue_size)
+
+        # Streams are long living, so they must not occupy request slots
+        self.add_handler("GET", path, stream.handle, priority=True, streaming=True)
+        return stream
+
+    def add_assets(self, prefix, component):
+        # Files are sent with sendfile, precompressed `.gz` and `.br`
+        # variants are picked according to `Accept-Encoding`
+        async def handler(request: aiohttp.web.Request):
+            asset = component.assets.find(request.match_info["path"])
+            if asset is None:
+                raise aiohttp.web.HTTPNotFound()
+
+            return aiohttp.web.FileResponse(asset.path)
+
+        self.add_handler("GET", prefix.rstrip("/") + "/{path:.+}", handler)
+
     async def on_initialize(self, config: Config):
         self._config = config
 
+        self._requests = self.metrics.counter(
+            "selfauto_webserver_requests_total",
+            "Handled HTTP requests",
+            ("method", "route", "status"),
+        )
+        self._request_duration = self.metrics.histogram(
+            "selfauto_webserver_request_duration_seconds",
+            "HTTP requests handling duration",
+            ("method", "route"),
+        )
+
+        # Running application can't be modified, so new one is
+        # created on every initialization
+        self._app = aiohttp.web.Application()
+        self._config_routes = []
+        self.__apply_admission_config()
+        for route in self._routes.values():
+            self.__add_route(route)
+
+        if config.metrics_path is not None:
+            self.__add_config_route(
+                Route("GET", config.metrics_path, self.__on_metrics_request, priority=True),
+                "metrics_path",
+            )
+
+        if config.event_stream_path is not None:
+            events_component = await self.find_component(events.Component)
+            if events_component is None:
+                raise RuntimeError(
+                    "Component 'events' is required by 'event_stream_path' option"
+                )
+
+            stream = EventStream(
+                events_component, self.logger, config.event_stream_queue_size
+            )
+            self.__add_config_route(
+                Route(
+                    "GET",
+                    config.event_stream_path,
+                    stream.handle,
+                    priority=True,
+                    streaming=True,
+                ),
+                "event_stream_path",
+            )
+
+    async def on_reconfigure(self, config: Config) -> bool:
+        # Only admission settings are applied in place, any other
+        # change requires server restart
+        in_place = {f: getattr(config, f) for f in ADMISSION_FIELDS}
+        if replace(self._config, **in_place) != config:
+            return False
+
+        self._config = config
+        self.__apply_admission_config()
+        return True
+
     async def run(self):
         await aiohttp.web._run_app(
             self._app,
@@ -52,29 +206,163 @@ class WebserverComponent(BasicComponent):
             access_log=self.logger if self._config.access_log_enabled else None,
         )
 
-    def __make_handler(self, actual_handler):
+    def __apply_admission_config(self):
+        self._limiter = None
+        if self._config.max_concurrency is not None:
+            self._limiter = self.__make_limiter(self._config.max_concurrency)
+
+        self._route_limiters = {}
+        self._priority_routes = set(self._config.priority_routes)
+        for route in list(self._routes.values()) + self._config_routes:
+            self.__apply_route_admission(route)
+
+    def __apply_route_admission(self, route: Route):
+        # Routes added before initialization are applied on initialization
+        if self._config is None:
+            return
+
+        max_concurrency = self._config.route_max_concurrency.get(
+            route.name, route.max_concurrency
+        )
+        if max_concurrency is not None:
+            self._route_limiters[route.name] = self.__make_limiter(max_concurrency)
+
+        if route.priority:
+            self._priority_routes.add(route.name)
+
+    def __reapply_route_admission(self, route: Route):
+        if self._config is None:
+            return
+
+        self._route_limiters.pop(route.name, None)
+        if route.name not in self._config.priority_routes:
+            self._priority_routes.discard(route.name)
+
+        self.__apply_route_admission(route)
+
+    def __add_route(self, route: Route):
+        self.__apply_route_admission(route)
+        self._app.add_routes(
+            [
+                getattr(aiohttp.web, route.method.lower())(
+                    route.path, self.__make_handler(route)
+                )
+            ]
+        )
+
+    def __add_config_route(self, route: Route, option: str):
+        if route.name in self._routes:
+            raise RuntimeError(
+                f"Route '{route.name}' is already added, '{option}' option has to be changed"
+            )
+
+        # Recorded, so admission is reapplied to them on reconfiguration
+        self._config_routes.append(route)
+        self.__add_route(route)
+
+    def __make_limiter(self, max_concurrency: int) -> AdmissionLimiter:
+        return AdmissionLimiter(
+            max_concurrency, self._config.max_queue_size, self._config.queue_timeout
+        )
+
+    def __make_overloaded_response(self):
+        return aiohttp.web.Response(
+            status=503,
+            headers={
+                aiohttp.hdrs.RETRY_AFTER: str(self._config.retry_after)
+            },
+        )
+
+    async def __on_metrics_request(self, request: aiohttp.web.Request):
+        return aiohttp.web.Response(
+            body=self.metrics.render().encode(),
+            headers={
+                aiohttp.hdrs.CONTENT_TYPE: "text/plain; version=0.0.4; charset=utf-8"
+            },
+        )
+
+    def __observe_request(self, route: Route, status, duration):
+        if self._requests is None:
+            return
+
+        self._requests.labels(route.method, route.path, str(status)).inc()
+        if not route.streaming:
+            self._request_duration.labels(route.method, route.path).observe(duration)
+
+    def __make_handler(self, route: Route):
         async def handler(request: aiohttp.web.Request):
-            response = None
-            try:
-                # 1. Executing before request middlewares
-                for mw in self._middlewares:
-                    await mw.on_before_request(request)
+            start = perf_counter()
+            status = 500
 
-                # 2. Actually executing handler
-                response = await actual_handler(request)
+            # Limiters are looked up on each request, so admission
+            # settings may be changed on the fly. Route limiter goes first,
+            # so requests queued on saturated route don't hold global slots
+            limiters = []
+            route_limiter = self._route_limiters.get(route.name)
+            if route_limiter is not None:
+                limiters.append(route_limiter)
 
-            except Exception as e:
-                # 3. If error acquired - handle it and rethrow
-                for mw in self._middlewares:
-                    await mw.on_error(request, e)
+            if self._limiter is not None and route.name not in self._priority_routes:
+                limiters.append(self._limiter)
 
-                raise e
+            acquired = []
+            try:
+                for limiter in limiters:
+                    if not await limiter.acquire():
+                        status = 503
+                        return self.__make_overloaded_response()
+                    acquired.append(limiter)
 
+                # Handler is looked up on each request, since it's
+                # replaced, when route is added again
+                response = await self.__handle_request(request, route.handler)
+                status = response.status
+                return response
+            except aiohttp.web.HTTPException as e:
+                status = e.status
+                raise
             finally:
-                # ??. Executing after request middlewares
-                for mw in self._middlewares:
-                    await mw.on_after_request(request, response)
+                for limiter in acquired:
+                    limiter.release()
 
-            return response
+                self.__observe_request(route, status, perf_counter() - start)
 
         return handler
+
+    async def __handle_request(self, request: aiohttp.web.Request, actual_handler):
+        response = None
+        try:
+            # 1. Executing before request middlewares, any of them
+            # may answer request by itself
+            for mw in self._middlewares:
+                response = await mw.on_before_request(request)
+                if response is not None:
+                    break
+
+            # 2. Looking for ready response only after all checks passed,
+            # so it's never served bypassing middlewares
+            if response is None:
+                for mw in self._middlewares:
+                    response = await mw.on_lookup(request)
+                    if response is not None:
+                        break
+
+            # 3. Actually executing handler
+            if response is None:
+                response = await actual_handler(request)
+
+        except Exception as e:
+            # 4. If error acquired - handle it and rethrow
+            for mw in self._middlewares:
+                await mw.on_error(request, e)
+
+            raise e
+
+        finally:
+            # ??. Executing after request middlewares
+            for mw in self._middlewares:
+                replacement = await mw.on_after_request(request, response)
+                if replacement is not None:
+                    response = replacement
+
+        return response
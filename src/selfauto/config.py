@@ -2,15 +2,47 @@ import dataclasses
 import typing as tp
 
 import dacite
-import yaml
+
+
+@dataclasses.dataclass
+class LoopMonitorConfig:
+    enabled: bool = False
+    # Period of loop lag sampling, seconds
+    interval: float = 0.1
+    # Loop blocks longer than this are attributed and logged, seconds
+    threshold: float = 0.1
+    # Amount of worst offenders in report
+    report_size: int = 10
+
+
+@dataclasses.dataclass
+class ExecutorsConfig:
+    # Pools sizes, `None` means default size of executor
+    threads: tp.Optional[int] = None
+    processes: tp.Optional[int] = None
+    # Calls of single component, running in each pool at once, `None` means no limit
+    default_quota: tp.Optional[int] = None
+    component_quotas: tp.Dict[str, int] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class ServiceConfig:
+    loop_monitor: LoopMonitorConfig = dataclasses.field(
+        default_factory=LoopMonitorConfig
+    )
+    executors: ExecutorsConfig = dataclasses.field(default_factory=ExecutorsConfig)
 
 
 @dataclasses.dataclass
 class Config:
     components: tp.Dict[str, dict]
+    service: ServiceConfig = dataclasses.field(default_factory=ServiceConfig)
 
     @staticmethod
     def load_from_file(path: str):
+        # Imported here to keep import of service cheap
+        import yaml
+
         with open(path, "r") as f:
             return dacite.from_dict(
                 Config, yaml.load(f, Loader=yaml.FullLoader).get("config")
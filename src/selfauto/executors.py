@@ -0,0 +1,95 @@
+from asyncio import Semaphore, get_running_loop, to_thread
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+from selfauto.config import ExecutorsConfig
+from selfauto.metrics import MetricsRegistry
+
+THREADS_POOL = "threads"
+PROCESSES_POOL = "processes"
+
+
+class Executors:
+    def __init__(self, config: ExecutorsConfig, metrics: MetricsRegistry):
+        self._config: ExecutorsConfig = config
+        self._pools: Dict[str, Executor] = {}
+        self._quotas: Dict[Tuple[str, str], Optional[Semaphore]] = {}
+
+        self._waiting = metrics.gauge(
+            "selfauto_executor_queue_depth",
+            "Calls waiting for component quota",
+            ("pool", "component"),
+        )
+        self._in_flight = metrics.gauge(
+            "selfauto_executor_in_flight",
+            "Calls submitted to pool and not finished yet",
+            ("pool", "component"),
+        )
+        self._duration = metrics.histogram(
+            "selfauto_executor_call_duration_seconds",
+            "Offloaded calls duration, including time in pool queue",
+            ("pool", "component"),
+        )
+
+    async def run_blocking(self, owner: str, fn, *args, **kwargs):
+        return await self.__run(THREADS_POOL, owner, partial(fn, *args, **kwargs))
+
+    async def run_cpu(self, owner: str, fn, *args, **kwargs):
+        # Function and arguments have to be picklable
+        return await self.__run(PROCESSES_POOL, owner, partial(fn, *args, **kwargs))
+
+    async def shutdown(self):
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    async def __run(self, pool_name: str, owner: str, call):
+        pool = self.__get_pool(pool_name)
+        quota = self.__get_quota(pool_name, owner)
+
+        waiting = self._waiting.labels(pool_name, owner)
+        in_flight = self._in_flight.labels(pool_name, owner)
+
+        if quota is not None:
+            waiting.inc()
+            try:
+                await quota.acquire()
+            finally:
+                waiting.dec()
+
+        in_flight.inc()
+        try:
+            with self._duration.labels(pool_name, owner).time():
+                return await get_running_loop().run_in_executor(pool, call)
+        finally:
+            in_flight.dec()
+            if quota is not None:
+                quota.release()
+
+    def __get_pool(self, name: str) -> Executor:
+        # Pools are created on first use, process pool is expensive to start
+        pool = self._pools.get(name)
+        if pool is not None:
+            return pool
+
+        if name == THREADS_POOL:
+            pool = ThreadPoolExecutor(
+                max_workers=self._config.threads, thread_name_prefix="selfauto"
+            )
+        else:
+            # Imported here, since it pulls multiprocessing into every service import
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=self._config.processes)
+
+        self._pools[name] = pool
+        return pool
+
+    def __get_quota(self, pool_name: str, owner: str) -> Optional[Semaphore]:
+        key = (pool_name, owner)
+        if key not in self._quotas:
+            limit = self._config.component_quotas.get(owner, self._config.default_quota)
+            self._quotas[key] = None if limit is None else Semaphore(limit)
+
+        return self._quotas[key]
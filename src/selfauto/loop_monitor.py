@@ -0,0 +1,217 @@
+from asyncio import current_task, get_running_loop, sleep, create_task, gather
+from dataclasses import dataclass
+from logging import Logger
+from threading import Event, Lock, Thread, get_ident
+from time import monotonic
+from traceback import format_stack
+from typing import Dict, List, Optional
+import inspect
+import sys
+
+from selfauto.config import LoopMonitorConfig
+from selfauto.components.basic_component import BasicComponent
+from selfauto.metrics import MetricsRegistry
+
+UNKNOWN_OWNER = "<unknown>"
+
+# Maximal depth of recorded stack samples
+STACK_LIMIT = 30
+
+
+@dataclass()
+class StallSample:
+    beat: float
+    owner: str
+    task_name: Optional[str]
+    stack: str
+
+
+@dataclass()
+class Offender:
+    owner: str
+    count: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+    worst_task_name: Optional[str] = None
+    worst_stack: Optional[str] = None
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        components: Dict[str, BasicComponent],
+        logger: Logger,
+        metrics: MetricsRegistry,
+        config: LoopMonitorConfig,
+    ):
+        self._components: Dict[str, BasicComponent] = components
+        self._logger: Logger = logger
+        self._config: LoopMonitorConfig = config
+        self._offenders: Dict[str, Offender] = {}
+        self._component_files: Dict[str, str] = {}
+
+        self._loop = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat: float = monotonic()
+        self._sample: Optional[StallSample] = None
+        self._lock: Lock = Lock()
+        self._stopped: Event = Event()
+        self._thread: Optional[Thread] = None
+        self._task = None
+
+        self._lag = metrics.histogram(
+            "selfauto_loop_lag_seconds",
+            "Delay of event loop wakeups",
+        )
+        self._stalls = metrics.counter(
+            "selfauto_loop_stalls_total",
+            "Event loop blocks longer than threshold",
+            ("component",),
+        )
+        self._stalled_time = metrics.counter(
+            "selfauto_loop_stalled_seconds_total",
+            "Time event loop was blocked longer than threshold",
+            ("component",),
+        )
+
+    @property
+    def offenders(self) -> List[Offender]:
+        return sorted(self._offenders.values(), key=lambda o: -o.total)[
+            : self._config.report_size
+        ]
+
+    def format_report(self) -> str:
+        lines = ["Event loop stalls by component:"]
+        for o in self.offenders:
+            lines.append(
+                f"  {o.owner}: {o.count} stalls, {o.total:.3f}s total, "
+                f"worst {o.worst:.3f}s in task {o.worst_task_name}"
+            )
+            if o.worst_stack:
+                lines.append(o.worst_stack.rstrip())
+
+        return "\n".join(lines)
+
+    def start(self):
+        self._loop = get_running_loop()
+        self._loop_thread_id = get_ident()
+        self._last_beat = monotonic()
+        self._stopped.clear()
+        self.__index_component_files()
+
+        # Loop can't observe itself while it's blocked, so
+        # stacks are sampled from separate thread
+        self._thread = Thread(
+            target=self.__watch, name="selfauto-loop-monitor", daemon=True
+        )
+        self._thread.start()
+        self._task = create_task(self.__measure(), name="loop-monitor")
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._offenders:
+            self._logger.warning(self.format_report())
+
+    async def __measure(self):
+        interval = self._config.interval
+        while True:
+            expected = self._loop.time() + interval
+            await sleep(interval)
+            lag = max(self._loop.time() - expected, 0.0)
+
+            self._last_beat = monotonic()
+            self._lag.observe(lag)
+
+            with self._lock:
+                sample, self._sample = self._sample, None
+
+            if lag >= self._config.threshold:
+                self.__record(lag, sample)
+
+    def __watch(self):
+        period = min(self._config.interval, self._config.threshold) / 2
+        while not self._stopped.wait(period):
+            beat = self._last_beat
+            stalled = monotonic() - beat - self._config.interval
+            if stalled < self._config.threshold:
+                continue
+
+            with self._lock:
+                # Single sample is taken per stall
+                if self._sample is not None and self._sample.beat == beat:
+                    continue
+
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+
+                task = current_task(self._loop)
+                self._sample = StallSample(
+                    beat=beat,
+                    owner=self.__find_owner(frame, task),
+                    task_name=None if task is None else task.get_name(),
+                    stack="".join(format_stack(frame, STACK_LIMIT)),
+                )
+
+    def __record(self, lag: float, sample: Optional[StallSample]):
+        owner = UNKNOWN_OWNER if sample is None else sample.owner
+
+        offender = self._offenders.get(owner)
+        if offender is None:
+            offender = self._offenders[owner] = Offender(owner=owner)
+
+        offender.count += 1
+        offender.total += lag
+        if lag > offender.worst:
+            offender.worst = lag
+            if sample is not None:
+                offender.worst_task_name = sample.task_name
+                offender.worst_stack = sample.stack
+
+        self._stalls.labels(owner).inc()
+        self._stalled_time.labels(owner).inc(lag)
+
+        if sample is None:
+            self._logger.warning("Event loop was blocked for %.3fs", lag)
+            return
+
+        self._logger.warning(
+            "Event loop was blocked for %.3fs by '%s' component in task %s\n%s",
+            lag,
+            owner,
+            sample.task_name,
+            sample.stack.rstrip(),
+        )
+
+    def __find_owner(self, frame, task) -> str:
+        # Innermost frame of component's code is the most precise owner
+        while frame is not None:
+            owner = self._component_files.get(frame.f_code.co_filename)
+            if owner is not None:
+                return owner
+            frame = frame.f_back
+
+        # Otherwise relying on task names, given by service: `<component>-<phase>`
+        if task is not None:
+            name = task.get_name().rsplit("-", 1)[0]
+            if name in self._components:
+                return name
+
+        return UNKNOWN_OWNER
+
+    def __index_component_files(self):
+        self._component_files = {}
+        for name, component in self._components.items():
+            for cls in type(component).__mro__:
+                if cls is BasicComponent or not issubclass(cls, BasicComponent):
+                    continue
+
+                try:
+                    self._component_files.setdefault(inspect.getfile(cls), name)
+                except TypeError:
+                    pass
@@ -0,0 +1,263 @@
+from bisect import bisect_left
+from math import inf
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def samples(self, name: str):
+        yield name, (), self.value
+
+
+class GaugeValue:
+    __slots__ = ("_value", "_function")
+
+    def __init__(self):
+        self._value: float = 0
+        self._function: Optional[Callable[[], float]] = None
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1):
+        self._value += amount
+
+    def dec(self, amount: float = 1):
+        self._value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        # Value is calculated only when metrics are collected
+        self._function = function
+
+    def samples(self, name: str):
+        yield name, (), self.value
+
+
+class HistogramValue:
+    __slots__ = ("_bounds", "_counts", "_sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds: Tuple[float, ...] = bounds
+        self._counts: List[int] = [0] * (len(bounds) + 1)
+        self._sum: float = 0
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._sum += value
+
+    def time(self) -> "HistogramTimer":
+        return HistogramTimer(self)
+
+    def samples(self, name: str):
+        cumulative = 0
+        for bound, count in zip(self._bounds + (inf,), self._counts):
+            cumulative += count
+            yield f"{name}_bucket", (("le", _format_value(bound)),), cumulative
+
+        yield f"{name}_sum", (), self._sum
+        yield f"{name}_count", (), cumulative
+
+
+class HistogramTimer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: HistogramValue):
+        self._histogram: HistogramValue = histogram
+        self._start: float = 0
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._histogram.observe(perf_counter() - self._start)
+
+
+class Metric:
+    TYPE = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self._name: str = name
+        self._documentation: str = documentation
+        self._labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+
+        if not self._labelnames:
+            self._children[()] = self._make_child()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def labels(self, *values):
+        # Children are cached, so callers may keep them to skip lookup
+        child = self._children.get(values)
+        if child is not None:
+            return child
+
+        if len(values) != len(self._labelnames):
+            raise ValueError(
+                f"Metric '{self._name}' expects labels {self._labelnames}, got {values}"
+            )
+
+        child = self._children[values] = self._make_child()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self._name} {_escape_help(self._documentation)}",
+            f"# TYPE {self._name} {self.TYPE}",
+        ]
+
+        for values, child in list(self._children.items()):
+            labels = tuple(zip(self._labelnames, values))
+            for name, extra_labels, value in child.samples(self._name):
+                lines.append(
+                    f"{name}{_format_labels(labels + extra_labels)} {_format_value(value)}"
+                )
+
+        return lines
+
+    def _make_child(self):
+        raise NotImplementedError()
+
+
+class Counter(Metric):
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1):
+        self._children[()].inc(amount)
+
+    def _make_child(self):
+        return CounterValue()
+
+
+class Gauge(Metric):
+    TYPE = "gauge"
+
+    def set(self, value: float):
+        self._children[()].set(value)
+
+    def inc(self, amount: float = 1):
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._children[()].dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._children[()].set_function(function)
+
+    def _make_child(self):
+        return GaugeValue()
+
+
+class Histogram(Metric):
+    TYPE = "histogram"
+
+    def __init__(self, *args, buckets=DEFAULT_BUCKETS, **kwargs):
+        self._bounds: Tuple[float, ...] = tuple(sorted(buckets))
+        super().__init__(*args, **kwargs)
+
+    def observe(self, value: float):
+        self._children[()].observe(value)
+
+    def time(self) -> HistogramTimer:
+        return self._children[()].time()
+
+    def _make_child(self):
+        return HistogramValue(self._bounds)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.__register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.__register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.__register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+    def __register(self, cls, name, documentation, labelnames, **kwargs):
+        # Registering same metric again returns existing one, so
+        # restarted components keep their values
+        metric = self._metrics.get(name)
+        if metric is not None:
+            if type(metric) is not cls:
+                raise ValueError(
+                    f"Metric '{name}' is already registered as {metric.TYPE}"
+                )
+            return metric
+
+        metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        return metric
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+
+    return (
+        "{"
+        + ",".join(
+            '{}="{}"'.format(
+                name,
+                str(value)
+                .replace("\\", "\\\\")
+                .replace("\n", "\\n")
+                .replace('"', '\\"'),
+            )
+            for name, value in labels
+        )
+        + "}"
+    )
+
+
+def _format_value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
@@ -2,16 +2,31 @@ import typing as tp
 import signal
 import dataclasses
 from logging import getLogger, Logger
-from asyncio import get_event_loop, create_task, gather
+from asyncio import (
+    get_event_loop,
+    get_running_loop,
+    create_task,
+    gather,
+    wait,
+    Lock,
+    Task,
+    Future,
+    FIRST_COMPLETED,
+)
+from time import perf_counter
 from asyncio.exceptions import CancelledError
 
-import yaml
 import dacite
-import aiofiles
 
 from selfauto.config import Config
+from selfauto.executors import Executors
+from selfauto.loop_monitor import LoopMonitor
+from selfauto.metrics import MetricsRegistry
+from selfauto.startup import ComponentStartup, StartupReport
 from selfauto.components.basic_component import BasicComponent
+from selfauto.components.registry import find_component_class
 from selfauto.utils.asyncio import check_tasks_results_error
+from selfauto.utils.graph import resolve_waves
 
 
 class Service:
@@ -20,6 +35,16 @@ class Service:
         self._tasks = []
         self._logger_factory = None
         self._logger: Logger = None
+        self._metrics: MetricsRegistry = MetricsRegistry()
+        self._startup_report: StartupReport = None
+        self._config: Config = None
+        self._config_path: tp.Optional[str] = None
+        self._run_tasks: tp.Dict[str, tp.Union[Task, Future]] = {}
+        self._reload_lock: Lock = Lock()
+        self._running: bool = False
+        self._stopping: bool = False
+        self._loop_monitor: tp.Optional[LoopMonitor] = None
+        self._executors: tp.Optional[Executors] = None
 
     @property
     def logger(self) -> Logger:
@@ -29,11 +54,58 @@ class Service:
         self._logger = self.make_logger(__name__)
         return self._logger
 
+    @property
+    def metrics(self) -> MetricsRegistry:
+        return self._metrics
+
+    @property
+    def startup_report(self) -> StartupReport:
+        return self._startup_report
+
+    @property
+    def loop_monitor(self) -> tp.Optional[LoopMonitor]:
+        return self._loop_monitor
+
+    @property
+    def executors(self) -> Executors:
+        return self._executors
+
     def add_components(self, cls_list):
         for c in cls_list:
             self.add_component(c)
 
+    def add_components_from_config(self, config: Config):
+        # Only components, that have config section, and dependencies of all
+        # components, including already added ones, are imported
+        pending = list(self._components.keys()) + list(config.components.keys())
+        visited = set()
+        while pending:
+            name = pending.pop(0)
+            if name in visited:
+                continue
+            visited.add(name)
+
+            component = self._components.get(name)
+            if component is not None:
+                cls = type(component)
+            else:
+                cls = find_component_class(name)
+                if cls is None:
+                    self.logger.debug(
+                        "No registered component for '%s' config section", name
+                    )
+                    continue
+
+                self.add_component(cls)
+
+            pending.extend(cls.dependency_names(config.components.get(name)))
+
     def add_component(self, cls):
+        if isinstance(cls, str):
+            name, cls = cls, find_component_class(cls)
+            if cls is None:
+                raise ValueError(f"Component '{name}' is not registered")
+
         if not hasattr(cls, "NAME"):
             raise ValueError(f"Component '{cls}' has no NAME property")
 
@@ -52,11 +124,25 @@ class Service:
     def __register_interrupt_handler(self):
         loop = get_event_loop()
 
-        signals = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
+        signals = (signal.SIGTERM, signal.SIGINT)
         for s in signals:
             loop.add_signal_handler(s, lambda: create_task(self.stop()))
 
+        loop.add_signal_handler(signal.SIGHUP, self.__on_hangup)
+
+    def __on_hangup(self):
+        # Config can be reloaded only if it's known where it came from
+        if self._config_path is None:
+            create_task(self.stop())
+            return
+
+        create_task(self.reload())
+
     async def generate_default_config(self, path: str):
+        # Imported here, since it's not needed for regular runs
+        import aiofiles
+        import yaml
+
         config = Config(
             components={
                 component_name: type(component).make_default_config()
@@ -71,43 +157,116 @@ class Service:
 
     async def stop(self):
         self.logger.info("Stopping execution")
-        for t in self._tasks:
+        self._stopping = True
+        for t in self._tasks + list(self._run_tasks.values()):
             t.cancel()
 
-    async def run(self, config: Config):
+    async def reload(self):
+        async with self._reload_lock:
+            if self._stopping or not self._running:
+                return
+
+            self.logger.info("Reloading config from '%s'", self._config_path)
+            try:
+                config = await self._executors.run_blocking(
+                    "service", Config.load_from_file, self._config_path
+                )
+            except Exception as e:
+                self.logger.error("Unable to load config, keeping old one", exc_info=e)
+                return
+
+            # Dependencies are reconfigured before components, that use them
+            for wave in self._startup_report.waves:
+                for name in wave:
+                    component = self._components[name]
+                    if not hasattr(type(component), "Config"):
+                        continue
+
+                    if config.components.get(name) == self._config.components.get(
+                        name
+                    ):
+                        continue
+
+                    # Section is remembered only once component took it, so
+                    # rejected one is retried on next reload
+                    if await self._reconfigure_component(component, config):
+                        self._config.components[name] = config.components[name]
+
+            self.logger.info("Config reloaded")
+
+    async def run(self, config: Config, config_path: tp.Optional[str] = None):
+        # Components sections are replaced one by one on reload
+        self._config = dataclasses.replace(config, components=dict(config.components))
+        self._config_path = config_path
+        self._stopping = False
         self.__register_interrupt_handler()
 
+        # Validating dependencies before anything is initialized
+        self._startup_report = self._make_startup_report()
+
+        self._executors = Executors(config.service.executors, self.metrics)
+
+        if config.service.loop_monitor.enabled:
+            self._loop_monitor = LoopMonitor(
+                self._components,
+                self.make_logger("loop_monitor"),
+                self.metrics,
+                config.service.loop_monitor,
+            )
+            self._loop_monitor.start()
+
         # Initializing
         try:
-            self.logger.info("Initializing component")
-            self._tasks = []
-            for name, component in self._components.items():
-                self._tasks.append(
-                    create_task(
-                        self._initialize_component(component, config),
-                        name=f"{name}-initialize",
-                    )
-                )
+            # Reload, requested during startup, waits until components are running
+            async with self._reload_lock:
+                self.logger.info("Initializing component")
+                started_at = perf_counter()
 
-            if not await check_tasks_results_error(
-                await gather(*self._tasks, return_exceptions=True)
-            ):
-                return
+                # Components are initialized as soon as their dependencies are ready
+                tasks = {}
+                for wave in self._startup_report.waves:
+                    for name in wave:
+                        startup = self._startup_report.components[name]
+                        tasks[name] = create_task(
+                            self._initialize_component(
+                                self._components[name],
+                                config,
+                                [tasks[d] for d in startup.dependencies],
+                                started_at,
+                            ),
+                            name=f"{name}-initialize",
+                        )
+                self._tasks = list(tasks.values())
 
-            # Running
-            self.logger.info("Initialization finished. Running components")
-            self._tasks = []
-            for name, component in self._components.items():
-                self._tasks.append(
-                    create_task(self._run_component(component), name=f"{name}-run")
-                )
+                if not await check_tasks_results_error(
+                    await gather(*self._tasks, return_exceptions=True)
+                ):
+                    return
 
-            if not await check_tasks_results_error(
-                await gather(*self._tasks, return_exceptions=True)
-            ):
-                return
+                self.logger.info(self._startup_report.format())
+
+                # Running
+                self.logger.info("Initialization finished. Running components")
+                self._tasks = []
+                for component in self._components.values():
+                    self.__start_component(component)
+                self._running = True
+
+            # Restarted components replace their tasks, so set of
+            # awaited tasks is refreshed on each wakeup
+            while True:
+                pending = [t for t in self._run_tasks.values() if not t.done()]
+                if not pending:
+                    break
+
+                await wait(pending, return_when=FIRST_COMPLETED)
         finally:
+            # Letting reload in progress finish before components are deinitialized
+            async with self._reload_lock:
+                self._running = False
+
             self.logger.info("Deinitializing component")
+            self._run_tasks = {}
             self._tasks = []
             for name, component in self._components.items():
                 self._tasks.append(
@@ -117,27 +276,60 @@ class Service:
                     )
                 )
 
-            if not await check_tasks_results_error(
-                await gather(*self._tasks, return_exceptions=True)
-            ):
+            results = await gather(*self._tasks, return_exceptions=True)
+
+            await self._executors.shutdown()
+
+            if self._loop_monitor is not None:
+                await self._loop_monitor.stop()
+
+            if not await check_tasks_results_error(results):
                 return
 
-    async def _initialize_component(self, component, config):
-        component_config = None
-        try:
-            if hasattr(type(component), "Config"):
-                component_name = type(component).NAME
-                if component_name not in config.components:
-                    raise RuntimeError(
-                        f"No component '{component_name}' config in config file"
-                    )
+    def _make_startup_report(self) -> StartupReport:
+        graph = {
+            name: type(component).dependency_names(self._config.components.get(name))
+            for name, component in self._components.items()
+        }
 
-                component_config = dacite.from_dict(
-                    type(component).Config,
-                    config.components[component_name],
-                )
+        return StartupReport(
+            waves=resolve_waves(graph),
+            components={
+                name: ComponentStartup(name=name, dependencies=dependencies)
+                for name, dependencies in graph.items()
+            },
+        )
+
+    async def _initialize_component(
+        self, component, config, dependencies=(), started_at=None
+    ):
+        component_name = type(component).NAME
+        if not await check_tasks_results_error(
+            await gather(*dependencies, return_exceptions=True)
+        ):
+            self.logger.error(
+                "Skipping initialization of '%s' component, its dependencies failed",
+                component_name,
+            )
+            raise RuntimeError(
+                f"Dependencies of '{component_name}' component failed to initialize"
+            )
 
-            await component.initialize(component_config)
+        startup = None
+        if started_at is not None:
+            startup = self._startup_report.components[component_name]
+            startup.started_at = perf_counter() - started_at
+
+        try:
+            await component.initialize(self._parse_component_config(component, config))
+
+            if startup is not None:
+                startup.finished_at = perf_counter() - started_at
+                self.metrics.gauge(
+                    "selfauto_component_initialization_seconds",
+                    "Time component took to initialize",
+                    ("component",),
+                ).labels(component_name).set(startup.duration)
         except Exception as e:
             self.logger.error(
                 "Received exception during initialization of '%s' component",
@@ -146,6 +338,74 @@ class Service:
             )
             raise
 
+    async def _reconfigure_component(self, component, config) -> bool:
+        name = type(component).NAME
+        try:
+            component_config = self._parse_component_config(component, config)
+            if await component.reconfigure(component_config):
+                self.logger.info("Component '%s' reconfigured", name)
+                return True
+        except Exception as e:
+            self.logger.error(
+                "Invalid new config of '%s' component, keeping old one",
+                name,
+                exc_info=e,
+            )
+            return False
+
+        # Component can't apply config in place, so only it is restarted.
+        # Until new run task is started, component is kept in running ones
+        # with placeholder, so service doesn't consider it finished
+        self.logger.info("Restarting '%s' component", name)
+        restarting = get_running_loop().create_future()
+        task = self._run_tasks.get(name)
+        self._run_tasks[name] = restarting
+        try:
+            if task is not None:
+                task.cancel()
+                await gather(task, return_exceptions=True)
+
+            await self._deinitialize_component(component)
+            try:
+                await self._initialize_component(component, config)
+                applied = True
+            except Exception:
+                self.logger.error("Restoring '%s' component with old config", name)
+                try:
+                    await self._initialize_component(component, self._config)
+                    applied = False
+                except Exception:
+                    await self.stop()
+                    return False
+
+            self.__start_component(component)
+            return applied
+        finally:
+            if not restarting.done():
+                restarting.set_result(None)
+
+    def _parse_component_config(self, component, config):
+        if not hasattr(type(component), "Config"):
+            return None
+
+        component_name = type(component).NAME
+        if component_name not in config.components:
+            raise RuntimeError(f"No component '{component_name}' config in config file")
+
+        return dacite.from_dict(
+            type(component).Config,
+            config.components[component_name],
+        )
+
+    def __start_component(self, component):
+        if self._stopping:
+            return
+
+        name = type(component).NAME
+        self._run_tasks[name] = create_task(
+            self._run_component(component), name=f"{name}-run"
+        )
+
     async def _deinitialize_component(self, component):
         try:
             await component.deinitialize()
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass()
+class ComponentStartup:
+    name: str
+    dependencies: List[str]
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+@dataclass()
+class StartupReport:
+    waves: List[List[str]]
+    components: Dict[str, ComponentStartup] = field(default_factory=dict)
+
+    @property
+    def total(self) -> float:
+        return max((c.finished_at for c in self.components.values()), default=0.0)
+
+    @property
+    def critical_path(self) -> List[str]:
+        # Chain of dependencies, that finished last, defines startup time
+        finished = [c for c in self.components.values() if c.finished_at]
+        if not finished:
+            return []
+
+        path = []
+        current = max(finished, key=lambda c: c.finished_at)
+        while current is not None:
+            path.append(current.name)
+            current = max(
+                (self.components[d] for d in current.dependencies),
+                key=lambda c: c.finished_at,
+                default=None,
+            )
+
+        return list(reversed(path))
+
+    def format(self) -> str:
+        lines = [f"Startup took {self.total:.3f}s"]
+        for c in sorted(self.components.values(), key=lambda c: c.started_at):
+            lines.append(
+                f"  {c.name}: {c.duration:.3f}s "
+                f"(started at {c.started_at:.3f}s, finished at {c.finished_at:.3f}s)"
+            )
+        lines.append(
+            f"  waves: {' -> '.join('[' + ', '.join(w) + ']' for w in self.waves)}"
+        )
+        lines.append(f"  critical path: {' -> '.join(self.critical_path)}")
+
+        return "\n".join(lines)
@@ -0,0 +1,43 @@
+from typing import Dict, Iterable, List
+
+
+def resolve_waves(graph: Dict[str, Iterable[str]]) -> List[List[str]]:
+    # Splits graph into waves, where each node depends only on nodes of previous waves
+    dependencies = {node: set(deps) for node, deps in graph.items()}
+
+    for node, deps in dependencies.items():
+        missing = deps - dependencies.keys()
+        if missing:
+            raise RuntimeError(
+                f"'{node}' depends on unknown {', '.join(map(repr, sorted(missing)))}"
+            )
+
+    waves = []
+    resolved = set()
+    while len(resolved) < len(dependencies):
+        wave = sorted(
+            node
+            for node, deps in dependencies.items()
+            if node not in resolved and deps <= resolved
+        )
+        if not wave:
+            raise RuntimeError(
+                f"Dependency cycle detected: {' -> '.join(_find_cycle(dependencies, resolved))}"
+            )
+
+        waves.append(wave)
+        resolved.update(wave)
+
+    return waves
+
+
+def _find_cycle(dependencies, resolved) -> List[str]:
+    # Every unresolved node has unresolved dependency, so walking
+    # through them is guaranteed to loop
+    path = []
+    node = min(node for node in dependencies if node not in resolved)
+    while node not in path:
+        path.append(node)
+        node = min(dep for dep in dependencies[node] if dep not in resolved)
+
+    return path[path.index(node) :] + [node]